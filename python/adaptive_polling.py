@@ -0,0 +1,194 @@
+# --- adaptive_polling.py ---
+import fcntl
+import heapq
+import math
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+import check_entry
+import snapshots
+from snapshots import latest_path, publish_snapshot
+
+ENTRY_BAND = 1.005          # mismo margen que check_entry_conditions_with_profit
+MIN_INTERVAL = 60           # segundos, tickers dentro o al borde de la banda
+MAX_INTERVAL = 30 * 60      # segundos, la cadencia fija anterior
+REQUESTS_PER_MINUTE = 60    # presupuesto global de peticiones a Bitvavo
+TICK_SECONDS = 5
+SAFETY_SIGMAS = 2           # volver a consultar antes de que un movimiento de 2σ alcance la banda
+DEFAULT_VOLATILITY = 0.01 / math.sqrt(3600)  # 1% por hora, hasta tener observaciones
+VOL_WINDOW = 20
+CANDLE_REQUESTS = 2         # velas 5m + 4h para los indicadores
+REPORT_EVERY = 60           # ticks entre resúmenes por consola
+LOCK_FILE = "adaptive_polling.lock"
+
+
+class TickerState:
+    def __init__(self, rows):
+        self.rows = rows
+        # Con varias filas (estrategias), la primera banda que toca el precio es la más alta
+        self.entry = max(row["Entry"] for row in rows)
+        self.prices = deque(maxlen=VOL_WINDOW)
+        self.distance = None
+
+    def observe(self, price, ts):
+        self.prices.append((ts, price))
+        self.distance = max(0.0, price / (self.entry * ENTRY_BAND) - 1)
+
+    # Volatilidad por √segundo estimada con los precios consultados
+    def volatility(self):
+        returns = []
+        for (t0, p0), (t1, p1) in zip(self.prices, list(self.prices)[1:]):
+            if t1 > t0 and p0 > 0 and p1 > 0:
+                returns.append(math.log(p1 / p0) / math.sqrt(t1 - t0))
+        if len(returns) < 2:
+            return DEFAULT_VOLATILITY
+        return max(float(pd.Series(returns).std()), DEFAULT_VOLATILITY / 10)
+
+    # Tiempo hasta que un movimiento de SAFETY_SIGMAS podría llevar el precio a la banda
+    def next_interval(self):
+        if self.distance is None:
+            return MIN_INTERVAL
+        horizon = (self.distance / (SAFETY_SIGMAS * self.volatility())) ** 2
+        return min(MAX_INTERVAL, max(MIN_INTERVAL, horizon))
+
+
+class AdaptivePoller:
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tick_seconds=TICK_SECONDS):
+        self.rate = requests_per_minute / 60
+        self.tick_seconds = tick_seconds
+        self.tokens = 0.0
+        self.states = {}
+        self.queue = []
+        self.due = {}
+        self.ready = {}
+        self.levels_path = None
+        self.columns = check_entry.ENTRY_COLUMNS
+        self.requests_made = 0
+
+    def load_levels(self, now):
+        path = latest_path("directional_frequent_levels.csv")
+        if path == self.levels_path or not os.path.exists(path):
+            return
+        try:
+            df_trades = pd.read_csv(path)
+        except Exception as e:
+            check_entry.log_error(f"Error leyendo niveles de entrada: {e}")
+            return
+
+        self.levels_path = path
+        self.columns = check_entry.ready_columns(df_trades.columns)
+        old_states = self.states
+        self.states = {}
+        for ticker, group in df_trades.groupby("Ticker", sort=False):
+            state = TickerState([row for _, row in group.iterrows()])
+            self.states[ticker] = state
+            if ticker not in old_states or ticker not in self.due:
+                self.schedule(ticker, now)
+                continue
+
+            # Se conserva la cita adaptativa; solo se adelanta si el nuevo nivel
+            # de entrada queda más cerca del último precio observado
+            state.prices = old_states[ticker].prices
+            due = self.due[ticker]
+            if state.prices:
+                last_ts, last_price = state.prices[-1]
+                state.distance = max(0.0, last_price / (state.entry * ENTRY_BAND) - 1)
+                due = min(due, last_ts + state.next_interval())
+            if due != self.due[ticker]:
+                self.schedule(ticker, due)
+
+        self.ready = {k: v for k, v in self.ready.items() if k in self.states}
+        print(f"📥 {len(self.states)} tickers cargados para polling adaptativo.")
+
+    def schedule(self, ticker, when):
+        self.due[ticker] = when
+        heapq.heappush(self.queue, (when, ticker))
+
+    def pop_due(self, now):
+        while self.queue and self.queue[0][0] <= now:
+            when, ticker = heapq.heappop(self.queue)
+            if self.due.get(ticker) == when and ticker in self.states:
+                return ticker
+        return None
+
+    def spend(self, cost):
+        self.tokens -= cost
+        self.requests_made += cost
+
+    def poll(self, ticker, now):
+        state = self.states[ticker]
+        self.spend(1)
+        price = check_entry.get_price(ticker)
+        if price is None:
+            # Un error puntual no debe dejar 30 minutos sin vigilar un ticker cercano a la entrada
+            self.schedule(ticker, now + state.next_interval())
+            return False
+
+        state.observe(price, now)
+        self.schedule(ticker, now + state.next_interval())
+
+        in_band = [row for row in state.rows if price <= row["Entry"] * ENTRY_BAND]
+        if not in_band:
+            return self.ready.pop(ticker, None) is not None
+
+        self.spend(CANDLE_REQUESTS)
+        ind = check_entry.fetch_indicators([ticker]).get(ticker)
+        if ind is None:
+            return False
+        self.ready[ticker] = [check_entry.build_entry_row(row, price, ind) for row in in_band]
+        return True
+
+    def publish(self):
+        # También se publica vacío, para que el dashboard no siga mostrando entradas caducadas
+        entries = [row for rows in self.ready.values() for row in rows]
+        publish_snapshot({"tickers_ready_full.csv": pd.DataFrame(entries, columns=self.columns)})
+        if not entries:
+            print("🚫 Ninguna crypto cumple condiciones de entrada ahora mismo.")
+            return
+        print(f"✅ {datetime.now().strftime('%H:%M:%S')} – {len(entries)} entradas publicadas en tickers_ready_full.csv")
+
+    def tick(self, now):
+        self.load_levels(now)
+        # Cubo de tokens: como máximo un tick de presupuesto acumulado
+        budget = self.rate * self.tick_seconds
+        self.tokens = min(self.tokens + budget, max(budget, 1 + CANDLE_REQUESTS))
+
+        changed = False
+        while self.tokens >= 1 + CANDLE_REQUESTS:
+            ticker = self.pop_due(now)
+            if ticker is None:
+                break
+            changed |= self.poll(ticker, now)
+
+        if changed:
+            self.publish()
+
+    def run(self, max_ticks=None):
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            started = time.time()
+            self.tick(started)
+            ticks += 1
+
+            if ticks % REPORT_EVERY == 0:
+                near = sum(1 for s in self.states.values() if s.distance is not None and s.next_interval() <= MIN_INTERVAL)
+                print(f"📡 {self.requests_made} peticiones – {near} tickers cerca de la entrada – {len(self.ready)} en banda")
+
+            time.sleep(max(0.0, self.tick_seconds - (time.time() - started)))
+
+
+if __name__ == "__main__":
+    # Un único poller por máquina: el presupuesto de peticiones es global
+    os.makedirs(snapshots.CSV_DIR, exist_ok=True)
+    with open(os.path.join(snapshots.CSV_DIR, LOCK_FILE), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print("ℹ️ Ya hay un poller adaptativo en marcha.")
+            sys.exit(0)
+        AdaptivePoller().run()
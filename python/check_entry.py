@@ -2,11 +2,18 @@
 import pandas as pd
 import requests
 from datetime import datetime
-import ta
 from technical_analysis import get_candles
+from indicators import compute_indicators_batch
+from snapshots import latest_path, publish_snapshot
 
 BITVAVO_URL = "https://api.bitvavo.com/v2"
 LOG_FILE = "error_log.txt"
+ENTRY_COLUMNS = ["Current Price", "RSI_15m", "MACD Trend 15m", "RSI_4h", "MACD Trend 4h", "Profit Target", "Unrealized PnL", "Results"]
+
+
+# Columnas de tickers_ready_full.csv: las del fichero de niveles más las de la entrada
+def ready_columns(level_columns):
+    return list(level_columns) + [c for c in ENTRY_COLUMNS if c not in level_columns]
 
 
 def log_error(message):
@@ -14,24 +21,7 @@ def log_error(message):
         log.write(f"{datetime.now().isoformat()} - {message}\n")
 
 
-def is_valid_market(ticker):
-    try:
-        res = requests.get(f"{BITVAVO_URL}/markets")
-        res.raise_for_status()
-        markets = res.json()
-        return ticker in [m['market'] for m in markets]
-    except Exception as e:
-        log_error(f"Error checking market {ticker}: {e}")
-        return False
-
-
-def get_current_price(ticker):
-    if not is_valid_market(ticker):
-        msg = f"{ticker} no es un mercado válido en Bitvavo."
-        print(f"❌ {msg}")
-        log_error(msg)
-        return None
-
+def get_price(ticker):
     url = f"{BITVAVO_URL}/ticker/price?market={ticker}"
     try:
         res = requests.get(url)
@@ -43,76 +33,121 @@ def get_current_price(ticker):
         return None
 
 
-def compute_indicators(df):
-    df = df.copy()
-    df["rsi"] = ta.momentum.RSIIndicator(close=df["close"]).rsi()
-    macd = ta.trend.MACD(close=df["close"])
-    df["macd"] = macd.macd()
-    df["macd_signal"] = macd.macd_signal()
-    df["macd_trend"] = df["macd"] > df["macd_signal"]
-    return df
-
-
-def check_entry_conditions_with_profit():
-    df_trades = pd.read_csv("csv/directional_frequent_levels.csv")
-    entries = []
-
-    for _, row in df_trades.iterrows():
-        ticker = row["Ticker"]
-        entry_price = row["Entry"]
-        quantity = row["Quantity"]
-        exit_price = row.get("Exit", None)
-        current_price = get_current_price(ticker)
-        if current_price is None:
-            continue
-
+def fetch_indicators(tickers):
+    frames_5m, frames_4h, fetched = [], [], []
+    for ticker in tickers:
         try:
-            df_15m = get_candles(ticker, interval="5m", limit=60)
+            df_5m = get_candles(ticker, interval="5m", limit=60)
             df_4h = get_candles(ticker, interval="4h", limit=60)
-            df_15m = compute_indicators(df_15m)
-            df_4h = compute_indicators(df_4h)
-            rsi_15m = df_15m["rsi"].dropna().iloc[-1]
-            macd_trend_15m = df_15m["macd_trend"].dropna().iloc[-1]
-            rsi_4h = df_4h["rsi"].dropna().iloc[-1]
-            macd_trend_4h = df_4h["macd_trend"].dropna().iloc[-1]
         except Exception as e:
-            log_error(f"{ticker} – Error en indicadores: {e}")
+            log_error(f"{ticker} – Error en velas: {e}")
             continue
+        # Solo se añade si ambos intervalos llegaron, para que las listas sigan alineadas
+        frames_5m.append(df_5m)
+        frames_4h.append(df_4h)
+        fetched.append(ticker)
+
+    # Una sola pasada vectorizada por intervalo para todos los candidatos
+    indicators = {}
+    for ticker, df_15m, df_4h in zip(fetched, compute_indicators_batch(frames_5m), compute_indicators_batch(frames_4h)):
+        try:
+            indicators[ticker] = {
+                "rsi_15m": df_15m["rsi"].dropna().iloc[-1],
+                "macd_trend_15m": df_15m["macd_trend"].dropna().iloc[-1],
+                "rsi_4h": df_4h["rsi"].dropna().iloc[-1],
+                "macd_trend_4h": df_4h["macd_trend"].dropna().iloc[-1]
+            }
+        except Exception as e:
+            log_error(f"{ticker} – Error en indicadores: {e}")
+    return indicators
 
-        # Condición de entrada: precio actual cercano al nivel de entrada simulado
-        if current_price <= entry_price * 1.005:
-            row_with_data = row.copy()
-            row_with_data["Current Price"] = round(current_price, 8)
-            row_with_data["RSI_15m"] = round(rsi_15m, 2)
-            row_with_data["MACD Trend 15m"] = "Alcista" if macd_trend_15m else "Bajista"
-            row_with_data["RSI_4h"] = round(rsi_4h, 2)
-            row_with_data["MACD Trend 4h"] = "Alcista" if macd_trend_4h else "Bajista"
 
-            if pd.notna(exit_price):
-                row_with_data["Profit Target"] = round((exit_price - entry_price) * quantity, 2)
-            else:
-                row_with_data["Profit Target"] = ""
+def build_entry_row(row, current_price, ind):
+    entry_price = row["Entry"]
+    quantity = row["Quantity"]
+    exit_price = row.get("Exit", None)
 
-            unrealized_pnl = round((current_price - entry_price) * quantity, 2)
-            row_with_data["Unrealized PnL"] = unrealized_pnl
+    row_with_data = row.copy()
+    row_with_data["Current Price"] = round(current_price, 8)
+    row_with_data["RSI_15m"] = round(ind["rsi_15m"], 2)
+    row_with_data["MACD Trend 15m"] = "Alcista" if ind["macd_trend_15m"] else "Bajista"
+    row_with_data["RSI_4h"] = round(ind["rsi_4h"], 2)
+    row_with_data["MACD Trend 4h"] = "Alcista" if ind["macd_trend_4h"] else "Bajista"
 
-            if unrealized_pnl > 0:
-                row_with_data["Results"] = "Profitable"
-            elif unrealized_pnl < 0:
-                row_with_data["Results"] = "At loss"
-            else:
-                row_with_data["Results"] = "Break-even"
+    if pd.notna(exit_price):
+        row_with_data["Profit Target"] = round((exit_price - entry_price) * quantity, 2)
+    else:
+        row_with_data["Profit Target"] = ""
 
-            entries.append(row_with_data)
+    unrealized_pnl = round((current_price - entry_price) * quantity, 2)
+    row_with_data["Unrealized PnL"] = unrealized_pnl
 
+    if unrealized_pnl > 0:
+        row_with_data["Results"] = "Profitable"
+    elif unrealized_pnl < 0:
+        row_with_data["Results"] = "At loss"
+    else:
+        row_with_data["Results"] = "Break-even"
+    return row_with_data
+
+
+def get_all_prices():
+    try:
+        res = requests.get(f"{BITVAVO_URL}/ticker/price")
+        res.raise_for_status()
+        return {p["market"]: float(p["price"]) for p in res.json() if p.get("price")}
+    except Exception as e:
+        print(f"⚠️ Error obteniendo precios: {e}")
+        log_error(f"Error obteniendo precios – {e}")
+        return {}
+
+
+def report_stages(stages):
+    print("🔎 Filtros de entrada:")
+    previous = None
+    for name, count in stages.items():
+        pruned = "" if previous is None else f" (−{previous - count})"
+        print(f"   {name:<22} {count}{pruned}")
+        previous = count
+
+
+# Pipeline por etapas, de la más barata a la más cara: solo los tickers que
+# superan un filtro llegan al siguiente.
+def check_entry_conditions_with_profit():
+    df_trades = pd.read_csv(latest_path("directional_frequent_levels.csv"))
+    entries = []
+    stages = {"Candidatos": len(df_trades)}
+
+    # 1. Precio actual de todos los mercados en una sola petición
+    prices = get_all_prices()
+    candidates = [(row, prices[row["Ticker"]]) for _, row in df_trades.iterrows() if row["Ticker"] in prices]
+    stages["Con precio"] = len(candidates)
+
+    # 2. Condición de entrada: precio actual cercano al nivel de entrada simulado
+    candidates = [(row, price) for row, price in candidates if price <= row["Entry"] * 1.005]
+    stages["En banda de entrada"] = len(candidates)
+
+    # 3. Velas e indicadores solo para los supervivientes
+    indicators = fetch_indicators(list(dict.fromkeys(row["Ticker"] for row, _ in candidates)))
+    for row, current_price in candidates:
+        ind = indicators.get(row["Ticker"])
+        if ind is not None:
+            entries.append(build_entry_row(row, current_price, ind))
+    stages["Con indicadores"] = len(entries)
+
+    report_stages(stages)
+
+    # También se publica vacío, para que el dashboard no siga mostrando entradas caducadas
+    df_ready = pd.DataFrame(entries, columns=ready_columns(df_trades.columns))
+    publish_snapshot({"tickers_ready_full.csv": df_ready})
     if not entries:
         print("🚫 Ninguna crypto cumple condiciones de entrada ahora mismo.")
     else:
-        df_ready = pd.DataFrame(entries)
-        df_ready.to_csv("csv/tickers_ready_full.csv", index=False)
         print("✅ Archivo generado: tickers_ready_full.csv")
         print(df_ready[["Ticker", "Entry", "Current Price", "RSI_15m", "RSI_4h", "MACD Trend 15m", "MACD Trend 4h", "Unrealized PnL", "Results"]])
 
+    return stages
+
 
 if __name__ == "__main__":
     check_entry_conditions_with_profit()
\ No newline at end of file
@@ -2,6 +2,7 @@ import pandas as pd
 import requests
 import os
 from datetime import datetime, timedelta
+from snapshots import latest_path, publish_snapshot
 
 BITVAVO_URL = "https://api.bitvavo.com/v2"
 
@@ -21,8 +22,8 @@ def get_candles_1m(ticker, start_dt, end_dt):
         print(f"⚠️ Error con {ticker}: {e}")
         return None
 
-def check_predictions_last_24h():
-    file_path = "csv/tickers_ready_full.csv"
+def check_predictions_last_24h(now=None):
+    file_path = latest_path("tickers_ready_full.csv")
     if not os.path.exists(file_path):
         print("⚠️ Archivo 'tickers_ready_full.csv' no encontrado. Ejecuta primero check_entry.py.")
         return
@@ -30,7 +31,7 @@ def check_predictions_last_24h():
     df = pd.read_csv(file_path)
     updated_rows = []
 
-    now = datetime.utcnow()
+    now = now or datetime.utcnow()
     start = now - timedelta(hours=24)
 
     for _, row in df.iterrows():
@@ -68,7 +69,7 @@ def check_predictions_last_24h():
         updated_rows.append(row)
 
     df_checked = pd.DataFrame(updated_rows)
-    df_checked.to_csv("csv/tickers_ready_24h_checked.csv", index=False)
+    publish_snapshot({"tickers_ready_24h_checked.csv": df_checked})
     print("✅ Verificación de las últimas 24h completada: tickers_ready_24h_checked.csv")
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+# --- checkpoints.py ---
+import json
+import os
+
+import snapshots
+
+CHECKPOINT_DIRNAME = "checkpoints"
+CYCLE_MINUTES = 30
+
+
+def checkpoint_dir():
+    return os.path.join(snapshots.CSV_DIR, CHECKPOINT_DIRNAME)
+
+
+# Identificador del ciclo del scheduler (franjas de 30 minutos)
+def cycle_id(now):
+    start = now.replace(minute=now.minute - now.minute % CYCLE_MINUTES, second=0, microsecond=0)
+    return start.strftime("%Y%m%dT%H%M")
+
+
+def journal_path(name, cycle):
+    return os.path.join(checkpoint_dir(), f"{name}_{cycle}.jsonl")
+
+
+# Registros ya completados en el ciclo, por ticker. Una última línea
+# incompleta (proceso muerto a mitad de escritura) se ignora.
+def load_journal(path):
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            records[record["Ticker"]] = record
+    return records
+
+
+def open_journal(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path, "a")
+
+
+def append_journal(journal, record):
+    journal.write(json.dumps(record) + "\n")
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+# Borra el journal de una ejecución terminada; los de otras ejecuciones
+# en curso (p. ej. el botón manual) no se tocan
+def clear_journal(path):
+    if os.path.exists(path):
+        os.remove(path)
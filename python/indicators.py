@@ -0,0 +1,94 @@
+# --- indicators.py ---
+import numpy as np
+
+RSI_WINDOW = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+
+
+# EMA por filas de una matriz (tickers × velas), con la misma recursión que
+# pandas `ewm(alpha, adjust=False, min_periods)`: los NaN iniciales (relleno
+# de series más cortas) se saltan y los intermedios solo envejecen el peso.
+def ema_2d(values, alpha, min_periods):
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    weighted = np.full(values.shape[0], np.nan)
+    old_wt = np.ones(values.shape[0])
+    nobs = np.zeros(values.shape[0], dtype=int)
+
+    for t in range(values.shape[1]):
+        cur = values[:, t]
+        is_obs = ~np.isnan(cur)
+        nobs += is_obs
+        started = ~np.isnan(weighted)
+
+        old_wt = np.where(started, old_wt * (1 - alpha), old_wt)
+        update = started & is_obs
+        weighted = np.where(update, (old_wt * weighted + alpha * cur) / (old_wt + alpha), weighted)
+        old_wt = np.where(update, 1.0, old_wt)
+        weighted = np.where(~started & is_obs, cur, weighted)
+
+        out[:, t] = np.where(nobs >= min_periods, weighted, np.nan)
+    return out
+
+
+# RSI de Wilder, equivalente a ta.momentum.RSIIndicator(window=14).rsi()
+def rsi_2d(close, window=RSI_WINDOW):
+    close = np.asarray(close, dtype=float)
+    diff = np.full(close.shape, np.nan)
+    diff[:, 1:] = close[:, 1:] - close[:, :-1]
+
+    # Como en ta, el primer diff (NaN) cuenta como 0; el relleno sigue siendo NaN
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+    padding = np.isnan(close)
+    up[padding] = np.nan
+    down[padding] = np.nan
+
+    ema_up = ema_2d(up, 1 / window, window)
+    ema_down = ema_2d(down, 1 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(ema_down == 0, 100.0, 100 - 100 / (1 + ema_up / ema_down))
+    return np.where(np.isnan(ema_down), np.nan, rsi)
+
+
+# MACD y señal, equivalentes a ta.trend.MACD(12, 26, 9)
+def macd_2d(close, fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL):
+    close = np.asarray(close, dtype=float)
+    ema_fast = ema_2d(close, 2 / (fast + 1), fast)
+    ema_slow = ema_2d(close, 2 / (slow + 1), slow)
+    macd = ema_fast - ema_slow
+    macd_signal = ema_2d(macd, 2 / (signal + 1), signal)
+    return macd, macd_signal
+
+
+# Apila los cierres alineados por la derecha (última vela común) y rellena
+# con NaN por la izquierda las series más cortas.
+def stack_closes(frames):
+    length = max((len(df) for df in frames), default=0)
+    close = np.full((len(frames), length), np.nan)
+    for i, df in enumerate(frames):
+        if len(df):
+            close[i, length - len(df):] = df["close"].to_numpy(dtype=float)
+    return close
+
+
+# RSI/MACD de varias series de un mismo intervalo en una sola pasada vectorizada
+def compute_indicators_batch(frames):
+    frames = list(frames)
+    close = stack_closes(frames)
+    rsi = rsi_2d(close)
+    macd, macd_signal = macd_2d(close)
+
+    results = []
+    for i, df in enumerate(frames):
+        df = df.copy()
+        n = len(df)
+        start = close.shape[1] - n
+        df["rsi"] = rsi[i, start:]
+        df["macd"] = macd[i, start:]
+        df["macd_signal"] = macd_signal[i, start:]
+        df["macd_trend"] = df["macd"] > df["macd_signal"]
+        results.append(df)
+    return results
@@ -0,0 +1,247 @@
+# --- replay.py ---
+import argparse
+import glob
+import os
+import time
+import pandas as pd
+from datetime import datetime, timedelta
+
+import snapshots
+import technical_analysis
+import check_entry
+import check_prediction
+
+HISTORY_DIR = "csv/history"
+REPLAY_DIR = "csv/replay"
+CYCLE_MINUTES = 30
+PREDICTION_EVERY = 8  # cada 4 horas con ciclos de 30 minutos
+RECORD_CHUNK = timedelta(minutes=1440)  # máximo de velas 1m por petición en Bitvavo
+WARMUP = timedelta(days=10)  # 60 velas de 4h para los indicadores de check_entry
+
+INTERVAL_RULES = {
+    "1m": "1min", "5m": "5min", "15m": "15min", "30m": "30min",
+    "1h": "1h", "2h": "2h", "4h": "4h", "6h": "6h", "8h": "8h", "12h": "12h", "1d": "1D"
+}
+
+
+class ReplayMarket:
+    # Sirve velas y precios desde el histórico local en lugar de Bitvavo,
+    # siempre recortados al reloj simulado `now`.
+
+    def __init__(self, history_dir=HISTORY_DIR, universe_multiplier=1):
+        self.now = None
+        self._history = {}
+        self._resampled = {}
+
+        for path in sorted(glob.glob(os.path.join(history_dir, "*.csv"))):
+            ticker = os.path.splitext(os.path.basename(path))[0]
+            df = pd.read_csv(path, parse_dates=["timestamp"])
+            self._history[ticker] = df.sort_values("timestamp").reset_index(drop=True)
+
+        if not self._history:
+            raise ValueError(f"No hay histórico en '{history_dir}'. Ejecuta primero 'replay.py record'.")
+
+        # Copias con alias (BTC-EUR#2, ...) para simular universos más grandes
+        self._aliases = {}
+        for ticker in self._history:
+            self._aliases[ticker] = ticker
+            for i in range(2, universe_multiplier + 1):
+                self._aliases[f"{ticker}#{i}"] = ticker
+
+    def tickers(self):
+        return list(self._aliases)
+
+    def time_range(self):
+        starts = [df["timestamp"].iloc[0] for df in self._history.values()]
+        ends = [df["timestamp"].iloc[-1] for df in self._history.values()]
+        return min(starts).to_pydatetime(), max(ends).to_pydatetime()
+
+    def _frame(self, ticker, interval):
+        source = self._aliases[ticker]
+        key = (source, interval)
+        if key not in self._resampled:
+            df = self._history[source]
+            if interval != "1m":
+                df = (
+                    df.set_index("timestamp")
+                    .resample(INTERVAL_RULES[interval], label="left", closed="left")
+                    .agg({"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+                    .dropna(subset=["close"])
+                    .reset_index()
+                )
+            self._resampled[key] = df
+        return self._resampled[key]
+
+    # --- Sustitutos de las llamadas a la API ---
+    def get_all_tickers(self):
+        return self.tickers()
+
+    def get_candles(self, ticker, interval="5m", limit=60):
+        df = self._frame(ticker, interval)
+        # Solo velas cerradas en el instante simulado, sin mirar al futuro
+        bar = pd.Timedelta(INTERVAL_RULES[interval])
+        end = df["timestamp"].searchsorted(pd.Timestamp(self.now) - bar, side="right")
+        return df.iloc[max(0, end - limit):end].reset_index(drop=True)
+
+    def get_current_price(self, ticker):
+        df = self._frame(ticker, "1m")
+        # Cierre de la última vela 1m ya cerrada, igual que en get_candles
+        end = df["timestamp"].searchsorted(pd.Timestamp(self.now) - pd.Timedelta("1min"), side="right")
+        if end == 0:
+            return None
+        return float(df["close"].iloc[end - 1])
+
+    def get_all_prices(self):
+        prices = {ticker: self.get_current_price(ticker) for ticker in self._aliases}
+        return {ticker: price for ticker, price in prices.items() if price is not None}
+
+    def get_candles_1m(self, ticker, start_dt, end_dt):
+        df = self._frame(ticker, "1m")
+        # Solo velas ya cerradas en end_dt: la que abre en end_dt aún no ha terminado
+        closed_until = pd.Timestamp(end_dt) - pd.Timedelta("1min")
+        mask = (df["timestamp"] >= pd.Timestamp(start_dt)) & (df["timestamp"] <= closed_until)
+        return df[mask].reset_index(drop=True)
+
+    def install(self):
+        technical_analysis.get_all_tickers = self.get_all_tickers
+        technical_analysis.get_candles = self.get_candles
+        check_entry.get_candles = self.get_candles
+        check_entry.get_price = self.get_current_price
+        check_entry.get_all_prices = self.get_all_prices
+        check_prediction.get_candles_1m = self.get_candles_1m
+
+
+def record_history(tickers, start, end, history_dir=HISTORY_DIR):
+    os.makedirs(history_dir, exist_ok=True)
+    for ticker in tickers:
+        chunks = []
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(chunk_start + RECORD_CHUNK, end)
+            df = check_prediction.get_candles_1m(ticker, chunk_start, chunk_end)
+            if df is not None and not df.empty:
+                chunks.append(df)
+            chunk_start = chunk_end
+
+        if not chunks:
+            print(f"⚠️ Sin datos para {ticker}")
+            continue
+
+        df = pd.concat(chunks).drop_duplicates("timestamp").sort_values("timestamp")
+        df.to_csv(os.path.join(history_dir, f"{ticker}.csv"), index=False)
+        print(f"💾 {ticker}: {len(df)} velas 1m guardadas.")
+
+
+def run_replay(start=None, end=None, history_dir=HISTORY_DIR, output_dir=REPLAY_DIR,
+               cycle_minutes=CYCLE_MINUTES, speed=None, universe_multiplier=1):
+    market = ReplayMarket(history_dir, universe_multiplier)
+    market.install()
+
+    first, last = market.time_range()
+    start = start or first + WARMUP
+    end = end or last
+    step = timedelta(minutes=cycle_minutes)
+    n_tickers = len(market.tickers())
+
+    os.makedirs(output_dir, exist_ok=True)
+    stats = []
+    replay_started = time.perf_counter()
+    cycle = 0
+    market.now = start
+
+    # El loop redirige snapshots.CSV_DIR a cada ciclo; se restaura siempre
+    csv_dir = snapshots.CSV_DIR
+    try:
+        while market.now <= end:
+            cycle += 1
+            snapshots.CSV_DIR = os.path.join(output_dir, f"cycle_{cycle:04d}")
+            os.makedirs(snapshots.CSV_DIR, exist_ok=True)
+            print(f"🔁 Ciclo {cycle} – {market.now.isoformat()}")
+
+            timings = {}
+            t0 = time.perf_counter()
+            technical_analysis.simulate_all(now=market.now)
+            timings["simulate_all_s"] = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            entry_stages = check_entry.check_entry_conditions_with_profit()
+            timings["check_entry_s"] = time.perf_counter() - t0
+
+            timings["check_prediction_s"] = 0.0
+            if cycle % PREDICTION_EVERY == 0:
+                t0 = time.perf_counter()
+                check_prediction.check_predictions_last_24h(now=market.now)
+                timings["check_prediction_s"] = time.perf_counter() - t0
+
+            cycle_seconds = sum(timings.values())
+            stats.append({
+                "Cycle": cycle,
+                "Simulated Time": market.now.isoformat(),
+                "Tickers": n_tickers,
+                **{k: round(v, 4) for k, v in timings.items()},
+                "cycle_s": round(cycle_seconds, 4),
+                "tickers_per_s": round(n_tickers / cycle_seconds, 2) if cycle_seconds else None,
+                **{f"Entry stage: {name}": count for name, count in entry_stages.items()}
+            })
+
+            # Con `speed` se limita el reloj a N veces el tiempo real; sin él, va lo más rápido posible
+            if speed:
+                target = cycle * step.total_seconds() / speed
+                wait = target - (time.perf_counter() - replay_started)
+                if wait > 0:
+                    time.sleep(wait)
+
+            market.now += step
+    finally:
+        snapshots.CSV_DIR = csv_dir
+
+    elapsed = time.perf_counter() - replay_started
+    df_stats = pd.DataFrame(stats)
+    df_stats.to_csv(os.path.join(output_dir, "throughput.csv"), index=False)
+
+    if cycle:
+        simulated = cycle * step.total_seconds()
+        print(f"✅ Replay completado: {cycle} ciclos en {elapsed:.1f}s")
+        print(f"⚡ {cycle / elapsed:.2f} ciclos/s – {cycle * n_tickers / elapsed:.1f} tickers/s – x{simulated / elapsed:.0f} tiempo real")
+    else:
+        print("🚫 El rango de fechas no contiene ningún ciclo.")
+    return df_stats
+
+
+def _parse_date(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay acelerado del pipeline sobre histórico local.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Descarga velas 1m de Bitvavo al histórico local.")
+    rec.add_argument("--tickers", nargs="*", help="Por defecto, todos los mercados.")
+    rec.add_argument("--days", type=int, default=14)
+    rec.add_argument("--history-dir", default=HISTORY_DIR)
+
+    run = sub.add_parser("run", help="Ejecuta el pipeline completo sobre el histórico local.")
+    run.add_argument("--start", help="Fecha ISO (UTC) de inicio del replay.")
+    run.add_argument("--end", help="Fecha ISO (UTC) de fin del replay.")
+    run.add_argument("--history-dir", default=HISTORY_DIR)
+    run.add_argument("--output-dir", default=REPLAY_DIR)
+    run.add_argument("--cycle-minutes", type=int, default=CYCLE_MINUTES)
+    run.add_argument("--speed", type=float, help="Factor sobre tiempo real (p. ej. 500). Sin él, máxima velocidad.")
+    run.add_argument("--universe-multiplier", type=int, default=1)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        end = datetime.utcnow()
+        tickers = args.tickers or technical_analysis.get_all_tickers()
+        record_history(tickers, end - timedelta(days=args.days), end, args.history_dir)
+    else:
+        run_replay(
+            start=_parse_date(args.start),
+            end=_parse_date(args.end),
+            history_dir=args.history_dir,
+            output_dir=args.output_dir,
+            cycle_minutes=args.cycle_minutes,
+            speed=args.speed,
+            universe_multiplier=args.universe_multiplier
+        )
@@ -9,18 +9,27 @@ import pytz
 import subprocess
 import sys
 import numpy as np
+from snapshots import manifest_version, read_manifest, resolve_path
+
+MANIFEST_POLL_SECONDS = 5
+SCAN_ATTEMPTS = 2
+POLLER_RESTART_SECONDS = 30
 
 # --- BACKGROUND SCHEDULER ---
 def background_scheduler():
     time.sleep(60)
+    # Las entradas las vigila el polling adaptativo; aquí solo se recalculan los niveles
     while True:
         print("🔁 Running 15-minute analysis...")
-        try:
-            subprocess.run([sys.executable, "python/technical_analysis.py"], check=True)
-            subprocess.run([sys.executable, "python/check_entry.py"], check=True)
-            print("✅ 15-minute analysis completed.")
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error running analysis scripts: {e}")
+        # El ciclo lo marca el propio scheduler, así un reintento reanuda su checkpoint
+        cycle = datetime.now().strftime("%Y%m%dT%H%M%S")
+        for attempt in range(1, SCAN_ATTEMPTS + 1):
+            try:
+                subprocess.run([sys.executable, "python/technical_analysis.py", "--cycle", cycle], check=True)
+                print("✅ 15-minute analysis completed.")
+                break
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Error running analysis scripts (attempt {attempt}/{SCAN_ATTEMPTS}): {e}")
 
         now = int(time.time())
         if now % (30 * 60) < 60:
@@ -33,13 +42,25 @@ def background_scheduler():
 
         time.sleep(1800)
 
-# --- Run scheduler only once ---
-if "scheduler_started" not in st.session_state:
+# --- ADAPTIVE POLLER SUPERVISOR ---
+def supervise_poller():
+    while True:
+        code = subprocess.Popen([sys.executable, "python/adaptive_polling.py"]).wait()
+        print(f"⚠️ Adaptive poller exited with code {code}, restarting in {POLLER_RESTART_SECONDS}s...")
+        time.sleep(POLLER_RESTART_SECONDS)
+
+# --- Run scheduler and poller only once per process ---
+# st.cache_resource se comparte entre todas las sesiones del navegador
+# Sin spinner y después de set_page_config, que debe ser el primer comando de Streamlit
+@st.cache_resource(show_spinner=False)
+def start_background_jobs():
     threading.Thread(target=background_scheduler, daemon=True).start()
-    st.session_state.scheduler_started = True
+    threading.Thread(target=supervise_poller, daemon=True).start()
+    return True
 
 # --- PAGE LAYOUT ---
 st.set_page_config(page_title="Crypto Entry Dashboard", layout="wide")
+start_background_jobs()
 st.markdown("## 📈 Crypto Entry-Exit Dashboard")
 st.markdown("*AI analysis of crypto trade signals*")
 st.markdown(
@@ -50,16 +71,31 @@ st.markdown("---")
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Crypto Dashboard", "💰 Calculadora Take Profit", "📅 Eventos Cripto", "📋 Verificar Reglas de Entrada"])
 
 # --- DATA LOADERS ---
-@st.cache_data(ttl=900)
-def load_main_data():
-    return pd.read_csv("csv/tickers_ready_full.csv")
-
-@st.cache_data(ttl=900)
-def load_checked_data():
-    path = "csv/tickers_ready_24h_checked.csv"
+# Cada ejecución lee el manifest una sola vez y resuelve las rutas de esa
+# versión. Los snapshots son inmutables, así que la ruta sirve de clave de
+# caché: cada versión publicada invalida los datos al momento, sin TTL.
+manifest = read_manifest()
+snapshot_version = manifest.get("version")
+st.session_state.snapshot_version = snapshot_version
+
+@st.cache_data
+def load_main_data(path):
+    return pd.read_csv(path)
+
+@st.cache_data
+def load_checked_data(path):
     return pd.read_csv(path) if os.path.exists(path) else None
 
-file_path = "csv/tickers_ready_full.csv"
+# --- SNAPSHOT WATCHER ---
+@st.fragment(run_every=MANIFEST_POLL_SECONDS)
+def watch_snapshots():
+    if manifest_version() != st.session_state.snapshot_version:
+        st.rerun()
+
+watch_snapshots()
+
+file_path = resolve_path(manifest, "tickers_ready_full.csv")
+checked_path = resolve_path(manifest, "tickers_ready_24h_checked.csv")
 
 st.markdown("### 🕒 Estado del Análisis")
 
@@ -67,7 +103,7 @@ amsterdam_time = datetime.now(pytz.timezone("Europe/Amsterdam"))
 st.write(f"🗓️ Última ejecución (Amsterdam): `{amsterdam_time.strftime('%Y-%m-%d %H:%M:%S')}`")
 
 if os.path.exists(file_path):
-    df_status = load_main_data()
+    df_status = load_main_data(file_path)
     if "Volatility between entry and exit" in df_status.columns and not df_status.empty:
         df_status["Volatility %"] = (
             df_status["Volatility between entry and exit"]
@@ -104,16 +140,17 @@ with tab1:
         st.info("⏳ Data is being prepared... Please wait for the first analysis or use the button above.")
         st.stop()
     else:
-        df = load_main_data()
+        df = load_main_data(file_path)
 
         # --- Sidebar Filters ---
         st.sidebar.header("⚙️ Filters")
         tickers = st.sidebar.multiselect("Select tickers:", options=sorted(df["Ticker"].unique()), default=sorted(df["Ticker"].unique()))
+        strategies = st.sidebar.multiselect("Select strategies:", options=sorted(df["Trigger Points"].unique()), default=sorted(df["Trigger Points"].unique()))
         result_filter = st.sidebar.selectbox("Filter by result:", ["All", "Profitable", "At loss", "Break-even"])
         rsi_min = st.sidebar.slider("RSI Minimum (any)", min_value=0, max_value=100, value=0)
         rsi_max = st.sidebar.slider("RSI Maximum (any)", min_value=0, max_value=100, value=100)
 
-        filtered_df = df[df["Ticker"].isin(tickers)]
+        filtered_df = df[df["Ticker"].isin(tickers) & df["Trigger Points"].isin(strategies)]
         if result_filter != "All":
             filtered_df = filtered_df[filtered_df["Results"] == result_filter]
 
@@ -123,7 +160,7 @@ with tab1:
         # --- Trade Overview Table ---
         st.subheader("🧾 Trade Overview")
         cols_to_show = [
-            "Date", "Ticker", "Average Price", "Entry", "Exit", "Current Price",
+            "Date", "Ticker", "Trigger Points", "Average Price", "Entry", "Exit", "Current Price",
             "Volatility between entry and exit", "RSI_15m", "MACD Trend 15m", "RSI_4h", "MACD Trend 4h", "Results"
         ]
 
@@ -182,7 +219,7 @@ with tab1:
         # --- Strategy Tables ---
         st.markdown("---")
         cols_to_show_long = [
-            "Date", "Ticker", "Average Price", "Entry", "Exit", "Current Price",
+            "Date", "Ticker", "Trigger Points", "Average Price", "Entry", "Exit", "Current Price",
             "Volatility between entry and exit", "RSI_4h", "MACD Trend 4h", "Results"
         ]
         st.subheader("📈 Long-Term Trading Opportunities")
@@ -203,7 +240,7 @@ with tab1:
 
         st.markdown("---")
         cols_to_show_short = [
-            "Date", "Ticker", "Average Price", "Entry", "Exit", "Current Price",
+            "Date", "Ticker", "Trigger Points", "Average Price", "Entry", "Exit", "Current Price",
             "Volatility between entry and exit", "RSI_15m", "MACD Trend 15m", "Results"
         ]
         st.subheader("⚡ Short-Term Trading Opportunities")
@@ -223,7 +260,7 @@ with tab1:
         )
 
         # --- Prediction Check Results ---
-        checked_df = load_checked_data()
+        checked_df = load_checked_data(checked_path)
         if checked_df is not None:
             st.markdown("---")
             st.subheader("📋 Prediction Check (Last 24h)")
@@ -0,0 +1,118 @@
+# --- snapshots.py ---
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+
+CSV_DIR = "csv"
+SNAPSHOT_DIRNAME = "snapshots"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "manifest.lock"
+KEEP_VERSIONS = 5
+
+
+def snapshot_root():
+    return os.path.join(CSV_DIR, SNAPSHOT_DIRNAME)
+
+
+def manifest_path():
+    return os.path.join(CSV_DIR, MANIFEST_FILE)
+
+
+def read_manifest():
+    path = manifest_path()
+    if not os.path.exists(path):
+        return {"version": None, "files": {}}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": None, "files": {}}
+
+
+# Lectura barata de la versión publicada, pensada para hacer polling
+def manifest_version():
+    return read_manifest().get("version")
+
+
+# Ruta de `name` según un manifest ya leído, o la ruta clásica en csv/
+def resolve_path(manifest, name):
+    path = manifest.get("files", {}).get(name)
+    if path and os.path.exists(path):
+        return path
+    return os.path.join(CSV_DIR, name)
+
+
+# Ruta de la última versión publicada de `name`
+def latest_path(name):
+    return resolve_path(read_manifest(), name)
+
+
+# Bloqueo exclusivo entre procesos (poller, technical_analysis, ...) para
+# el ciclo leer manifest → escribir → reemplazar
+@contextmanager
+def manifest_lock():
+    os.makedirs(CSV_DIR, exist_ok=True)
+    with open(os.path.join(CSV_DIR, LOCK_FILE), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_json_atomic(data, path):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".manifest-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Publica {nombre_csv: DataFrame} como una versión inmutable en
+# csv/snapshots/<versión>/ y actualiza el manifest de forma atómica.
+# Los ficheros no incluidos siguen apuntando a su versión anterior.
+def publish_snapshot(frames):
+    os.makedirs(snapshot_root(), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=snapshot_root(), suffix=".tmp")
+    for name, df in frames.items():
+        df.to_csv(os.path.join(tmp_dir, name), index=False)
+
+    with manifest_lock():
+        version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        version_dir = os.path.join(snapshot_root(), version)
+        os.replace(tmp_dir, version_dir)
+
+        manifest = read_manifest()
+        files = dict(manifest.get("files", {}))
+        for name in frames:
+            files[name] = os.path.join(version_dir, name)
+        _write_json_atomic({
+            "version": version,
+            "published_at": datetime.now().isoformat(),
+            "files": files
+        }, manifest_path())
+
+        prune_snapshots(files)
+    return version
+
+
+# Elimina versiones antiguas que ya no referencia el manifest
+def prune_snapshots(files, keep=KEEP_VERSIONS):
+    root = snapshot_root()
+    if not os.path.isdir(root):
+        return
+    in_use = {os.path.basename(os.path.dirname(p)) for p in files.values()}
+    versions = sorted(v for v in os.listdir(root) if not v.endswith(".tmp"))
+    for version in versions[:-keep]:
+        if version not in in_use:
+            shutil.rmtree(os.path.join(root, version), ignore_errors=True)
@@ -0,0 +1,132 @@
+# --- strategies.py ---
+from abc import ABC, abstractmethod
+
+import numpy as np
+from indicators import compute_indicators_batch
+
+MIN_CANDLES = 10
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
+
+def frequent_levels(prices, bins=20):
+    hist, edges = np.histogram(prices, bins=bins)
+    idx_low = np.argmax(hist[:len(hist)//2])
+    idx_high = np.argmax(hist[len(hist)//2:]) + len(hist)//2
+    low_level = round((edges[idx_low] + edges[idx_low+1])/2, 4)
+    high_level = round((edges[idx_high] + edges[idx_high+1])/2, 4)
+    return low_level, high_level
+
+
+def direction(df, idx, period=5):
+    if idx < period:
+        return None
+    ma_prev = df['close'].iloc[idx-period:idx].mean()
+    price_now = df['close'].iloc[idx]
+    return "up" if price_now > ma_prev else "down"
+
+
+def trade_with_direction(df):
+    low_level, high_level = frequent_levels(df['close'])
+    entry_price, exit_price, entry_date, exit_date = None, None, None, None
+
+    for i in range(5, len(df)):
+        price = df['close'].iloc[i]
+        current_direction = direction(df, i)
+
+        if entry_price is None:
+            if price <= low_level and current_direction == "up":
+                entry_price = price
+                entry_date = df['timestamp'].iloc[i]
+        elif entry_price is not None:
+            if price >= high_level and current_direction == "down":
+                exit_price = price
+                exit_date = df['timestamp'].iloc[i]
+                break
+
+    if entry_price and exit_price:
+        volatility = ((exit_price - entry_price) / entry_price) * 100
+        trade_duration = exit_date - entry_date
+        return entry_price, exit_price, volatility, trade_duration
+    else:
+        return None, None, None, None
+
+
+# Velas e indicadores de un ticker: cada intervalo se descarga y se calcula
+# una sola vez y lo comparten todas las estrategias.
+class MarketData:
+    def __init__(self, ticker, fetch, limits):
+        self.ticker = ticker
+        self._fetch = fetch
+        self._limits = limits
+        self._candles = {}
+        self._indicators = {}
+
+    def candles(self, interval):
+        if interval not in self._candles:
+            self._candles[interval] = self._fetch(self.ticker, interval=interval, limit=self._limits[interval])
+        return self._candles[interval]
+
+    def indicators(self, interval):
+        if interval not in self._indicators:
+            self._indicators[interval] = compute_indicators_batch([self.candles(interval)])[0]
+        return self._indicators[interval]
+
+    def has_enough_data(self):
+        return all(len(self.candles(interval)) >= MIN_CANDLES for interval in self._limits)
+
+
+# Interfaz de estrategia: `candles` declara {intervalo: nº de velas} y
+# `simulate` devuelve (entry, exit, volatility %, duración) o Nones.
+# Al ser abstracta, una estrategia incompleta falla al instanciarla en
+# STRATEGIES, no a mitad de un escaneo.
+class Strategy(ABC):
+    name = ""
+    candles = {}
+
+    @abstractmethod
+    def simulate(self, data):
+        pass
+
+
+class FrequentLevelsStrategy(Strategy):
+    name = "Frequent Levels with Direction"
+    candles = {"15m": 120}
+
+    def simulate(self, data):
+        return trade_with_direction(data.candles("15m"))
+
+
+# Entrada cuando el RSI sale de sobreventa, salida al llegar a sobrecompra
+class RsiReboundStrategy(Strategy):
+    name = "RSI Rebound 15m"
+    candles = {"15m": 120}
+
+    def simulate(self, data):
+        df = data.indicators("15m")
+        rsi = df["rsi"].to_numpy()
+        entry_price, entry_date = None, None
+
+        for i in range(1, len(df)):
+            if entry_price is None:
+                if rsi[i - 1] < RSI_OVERSOLD <= rsi[i]:
+                    entry_price = df["close"].iloc[i]
+                    entry_date = df["timestamp"].iloc[i]
+            elif rsi[i] >= RSI_OVERBOUGHT:
+                exit_price = df["close"].iloc[i]
+                volatility = ((exit_price - entry_price) / entry_price) * 100
+                return entry_price, exit_price, volatility, df["timestamp"].iloc[i] - entry_date
+
+        return None, None, None, None
+
+
+STRATEGIES = [FrequentLevelsStrategy(), RsiReboundStrategy()]
+
+
+# Velas necesarias por intervalo para un conjunto de estrategias (el máximo de cada una)
+def candle_limits(strategies):
+    limits = {}
+    for strategy in strategies:
+        for interval, limit in strategy.candles.items():
+            limits[interval] = max(limits.get(interval, 0), limit)
+    return limits
@@ -1,11 +1,20 @@
 # --- technical_analysis.py ---
+import argparse
 import requests
 import pandas as pd
-import numpy as np
 from datetime import datetime
+from snapshots import publish_snapshot
+from strategies import STRATEGIES, MarketData, candle_limits
+from checkpoints import append_journal, clear_journal, cycle_id, journal_path, load_journal, open_journal
 
 BITVAVO_URL = "https://api.bitvavo.com/v2"
 INVESTED_MONEY = 500
+JOURNAL_NAME = "simulate_all"
+TRADE_COLUMNS = [
+    "Date", "Ticker", "Average Price", "Quantity", "Invested Money", "Entry", "Exit",
+    "Volatility between entry and exit", "No entry", "No Exit", "Trigger Points",
+    "Profit Target", "Trade Time Expected", "Results", "Trade Time"
+]
 
 
 def get_all_tickers():
@@ -22,102 +31,102 @@ def get_candles(ticker, interval="5m", limit=60):
     return df.sort_values("timestamp").reset_index(drop=True)
 
 
-def frequent_levels(prices, bins=20):
-    hist, edges = np.histogram(prices, bins=bins)
-    idx_low = np.argmax(hist[:len(hist)//2])
-    idx_high = np.argmax(hist[len(hist)//2:]) + len(hist)//2
-    low_level = round((edges[idx_low] + edges[idx_low+1])/2, 4)
-    high_level = round((edges[idx_high] + edges[idx_high+1])/2, 4)
-    return low_level, high_level
-
-
-def direction(df, idx, period=5):
-    if idx < period:
-        return None
-    ma_prev = df['close'].iloc[idx-period:idx].mean()
-    price_now = df['close'].iloc[idx]
-    return "up" if price_now > ma_prev else "down"
-
-
-def trade_with_direction(df):
-    low_level, high_level = frequent_levels(df['close'])
-    entry_price, exit_price, entry_date, exit_date = None, None, None, None
-
-    for i in range(5, len(df)):
-        price = df['close'].iloc[i]
-        current_direction = direction(df, i)
-
-        if entry_price is None:
-            if price <= low_level and current_direction == "up":
-                entry_price = price
-                entry_date = df['timestamp'].iloc[i]
-        elif entry_price is not None:
-            if price >= high_level and current_direction == "down":
-                exit_price = price
-                exit_date = df['timestamp'].iloc[i]
-                break
-
-    if entry_price and exit_price:
-        volatility = ((exit_price - entry_price) / entry_price) * 100
-        trade_duration = exit_date - entry_date
-        return entry_price, exit_price, volatility, trade_duration
-    else:
-        return None, None, None, None
-
-
-def simulate_all():
-    now = datetime.now().strftime("%Y-%m-%d")
+def simulate_ticker(ticker, date, strategies=STRATEGIES):
+    # Una sola descarga de velas por ticker para todas las estrategias
+    data = MarketData(ticker, get_candles, candle_limits(strategies))
+    if not data.has_enough_data():
+        return [], "Insufficient data"
+
+    rows = []
+    for strategy in strategies:
+        entry, exit_price, volatility, duration = strategy.simulate(data)
+        if entry and exit_price:
+            rows.append(build_trade_row(ticker, date, strategy.name, entry, exit_price, volatility, duration))
+
+    if not rows:
+        return [], "No clear entry/exit from any strategy"
+    return rows, None
+
+
+def build_trade_row(ticker, date, trigger, entry, exit_price, volatility, duration):
+    avg_price = (entry + exit_price) / 2
+    quantity = round(INVESTED_MONEY / avg_price, 4)
+    profit_target = round(quantity * (exit_price - entry), 2)
+    trade_time_str = str(duration)
+
+    return {
+        "Date": date,
+        "Ticker": ticker,
+        "Average Price": round(avg_price, 4),
+        "Quantity": quantity,
+        "Invested Money": INVESTED_MONEY,
+        "Entry": round(entry, 4),
+        "Exit": round(exit_price, 4),
+        "Volatility between entry and exit": f"{round(volatility,2)}%",
+        "No entry": "No",
+        "No Exit": "No",
+        "Trigger Points": trigger,
+        "Profit Target": f"{profit_target} EUR",
+        "Trade Time Expected": trade_time_str,
+        "Results": "",
+        "Trade Time": ""
+    }
+
+
+def simulate_all(now=None, cycle=None):
+    now = now or datetime.now()
+    date = now.strftime("%Y-%m-%d")
     tickers = get_all_tickers()
     results, skipped = [], []
 
-    for ticker in tickers:
-        try:
-            df = get_candles(ticker, interval="15m", limit=120)
-            if len(df) < 10:
-                skipped.append((ticker, "Insufficient data"))
+    # Cada ticker terminado se guarda en el journal del ciclo; si el escaneo
+    # se interrumpe, la siguiente ejecución del mismo ciclo continúa desde ahí.
+    # `cycle` lo fija el scheduler para que sus reintentos compartan journal;
+    # sin él, se usa la franja de 30 minutos del reloj.
+    journal_file = journal_path(JOURNAL_NAME, cycle or cycle_id(now))
+    records = load_journal(journal_file)
+    if records:
+        print(f"♻️ Reanudando escaneo: {len(records)} tickers ya completados en este ciclo.")
+
+    with open_journal(journal_file) as journal:
+        for ticker in tickers:
+            if ticker in records:
                 continue
-
-            entry, exit_price, volatility, duration = trade_with_direction(df)
-
-            if not entry or not exit_price:
-                skipped.append((ticker, "No clear directional entry/exit"))
+            try:
+                rows, reason = simulate_ticker(ticker, date)
+            except Exception as e:
+                # Sin checkpoint: un error puntual se reintenta al reanudar
+                records[ticker] = {"Ticker": ticker, "Results": [], "Reason": f"Exception: {e}"}
                 continue
+            records[ticker] = {"Ticker": ticker, "Results": rows, "Reason": reason}
+            append_journal(journal, records[ticker])
 
-            avg_price = (entry + exit_price) / 2
-            quantity = round(INVESTED_MONEY / avg_price, 4)
-            profit_target = round(quantity * (exit_price - entry), 2)
-            trade_time_str = str(duration)
-
-            results.append({
-                "Date": now,
-                "Ticker": ticker,
-                "Average Price": round(avg_price, 4),
-                "Quantity": quantity,
-                "Invested Money": INVESTED_MONEY,
-                "Entry": round(entry, 4),
-                "Exit": round(exit_price, 4),
-                "Volatility between entry and exit": f"{round(volatility,2)}%",
-                "No entry": "No",
-                "No Exit": "No",
-                "Trigger Points": "Frequent Levels with Direction",
-                "Profit Target": f"{profit_target} EUR",
-                "Trade Time Expected": trade_time_str,
-                "Results": "",
-                "Trade Time": ""
-            })
-
-        except Exception as e:
-            skipped.append((ticker, f"Exception: {e}"))
-
-    df_results = pd.DataFrame(results)
+    for ticker in tickers:
+        record = records.get(ticker)
+        if record is None:
+            continue
+        if record["Results"]:
+            results.extend(record["Results"])
+        else:
+            skipped.append((ticker, record["Reason"]))
+
+    # Con columnas explícitas, un ciclo sin resultados sigue siendo un CSV legible
+    df_results = pd.DataFrame(results, columns=TRADE_COLUMNS)
     df_skipped = pd.DataFrame(skipped, columns=["Ticker", "Reason"])
 
-    df_results.to_csv("csv/directional_frequent_levels.csv", index=False)
-    df_skipped.to_csv("csv/directional_frequent_levels_skipped.csv", index=False)
+    publish_snapshot({
+        "directional_frequent_levels.csv": df_results,
+        "directional_frequent_levels_skipped.csv": df_skipped
+    })
+    clear_journal(journal_file)
 
-    print(f"✅ {len(results)} tickers procesados correctamente.")
+    # Un ticker puede aportar una fila por cada estrategia que lo detecta
+    print(f"✅ {len(df_results['Ticker'].unique())} tickers procesados correctamente ({len(results)} filas).")
     print(f"⚠️ {len(skipped)} tickers omitidos. Revisa 'directional_frequent_levels_skipped.csv'.")
 
 
 if __name__ == "__main__":
-    simulate_all()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycle", help="Identificador del ciclo del scheduler para reanudar desde su checkpoint.")
+    args = parser.parse_args()
+    simulate_all(cycle=args.cycle)
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+import check_entry
+
+
+def _candles(closes):
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2026-01-01", periods=len(closes), freq="5min"),
+        "close": closes
+    })
+
+
+def test_fetch_indicators_keeps_tickers_aligned_when_one_interval_fails(monkeypatch, tmp_path):
+    up = _candles(np.linspace(100, 200, 60))
+    down = _candles(np.linspace(200, 100, 60))
+
+    def fake_get_candles(ticker, interval="5m", limit=60):
+        if ticker == "A-EUR" and interval == "4h":
+            raise ValueError("4h no disponible")
+        return up if ticker == "A-EUR" else down
+
+    monkeypatch.setattr(check_entry, "get_candles", fake_get_candles)
+    monkeypatch.setattr(check_entry, "LOG_FILE", str(tmp_path / "error_log.txt"))
+
+    indicators = check_entry.fetch_indicators(["A-EUR", "B-EUR"])
+
+    assert "A-EUR" not in indicators
+    assert indicators["B-EUR"]["rsi_15m"] == 0
+    assert not indicators["B-EUR"]["macd_trend_15m"]
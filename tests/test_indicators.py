@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+from indicators import compute_indicators_batch
+
+TOLERANCE = 1e-9
+
+
+def _random_frames(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    return [pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))}) for n in lengths]
+
+
+def _assert_matches_ta(frames):
+    for df, batch in zip(frames, compute_indicators_batch(frames)):
+        macd = ta.trend.MACD(close=df["close"])
+        expected = {
+            "rsi": ta.momentum.RSIIndicator(close=df["close"]).rsi(),
+            "macd": macd.macd(),
+            "macd_signal": macd.macd_signal()
+        }
+        for column, reference in expected.items():
+            ours = batch[column].to_numpy()
+            theirs = reference.to_numpy()
+            assert np.array_equal(np.isnan(ours), np.isnan(theirs)), f"{column}: posiciones NaN distintas a ta"
+            mask = ~np.isnan(theirs)
+            np.testing.assert_allclose(ours[mask], theirs[mask], rtol=0, atol=TOLERANCE)
+
+
+def test_matches_ta_on_unequal_length_series():
+    rng = np.random.default_rng(1)
+    _assert_matches_ta(_random_frames(rng.integers(20, 120, 50), seed=2))
+
+
+@pytest.mark.parametrize("length", [1, 2, 13, 14, 15, 25, 26, 33, 34])
+def test_matches_ta_on_too_short_series(length):
+    # Mezcladas con una serie larga, para comprobar también el relleno por la izquierda
+    _assert_matches_ta(_random_frames([length, 120], seed=length))
+
+
+def test_matches_ta_on_flat_series():
+    _assert_matches_ta([pd.DataFrame({"close": np.full(60, 5.0)}), _random_frames([60])[0]])